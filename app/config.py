@@ -20,4 +20,5 @@ DEFAULT_CALENDAR_ID = _config.get("DEFAULT_CALENDAR_ID", "")
 ICS_URL = _config.get("ICS_URL", "")
 OUTPUT_JSON_FILE = os.path.join(DATA_PATH, _config.get("OUTPUT_JSON_FILE", "events.json"))
 LOG_FILE = os.path.join(DATA_PATH, _config.get("LOG_FILE", "application.log"))
-LOG_LEVEL = _config.get("LOG_LEVEL", "INFO")
\ No newline at end of file
+LOG_LEVEL = _config.get("LOG_LEVEL", "INFO")
+LOG_SAMPLE_SIZE = int(_config.get("LOG_SAMPLE_SIZE", 5))
\ No newline at end of file
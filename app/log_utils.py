@@ -0,0 +1,103 @@
+import logging
+import logging.handlers
+import queue
+import config
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_listener = None
+_handler = None
+_saved_root = None
+
+
+def setup_logging(console=True):
+    """初始化 logging：主執行緒格式化訊息後放進 queue，由背景執行緒寫入檔案與終端機。
+
+    僅在第一次呼叫時生效，回傳 QueueListener，結束前須呼叫 stop_logging() 以寫出剩餘紀錄。
+    root logger 原有的 level 與 handlers 會先保存並移除，於 stop_logging() 時還原。
+    """
+    global _listener, _handler, _saved_root
+    if _listener is not None:
+        return _listener
+
+    level = getattr(logging, config.LOG_LEVEL.upper(), logging.INFO)
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    handlers = []
+    file_handler = logging.FileHandler(config.LOG_FILE, encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    handlers.append(file_handler)
+
+    # 新增 StreamHandler 將 log 輸出到終端機
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    _saved_root = (root.level, root.handlers[:])
+    for handler in _saved_root[1]:
+        root.removeHandler(handler)
+    root.setLevel(level)
+    _handler = logging.handlers.QueueHandler(log_queue)
+    root.addHandler(_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    global _listener, _handler, _saved_root
+    if _listener is not None:
+        # 先移除 handler，避免之後的紀錄進入無人讀取的 queue，再還原原有設定
+        root = logging.getLogger()
+        root.removeHandler(_handler)
+        level, handlers = _saved_root
+        root.setLevel(level)
+        for handler in handlers:
+            root.addHandler(handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _handler = None
+        _saved_root = None
+
+
+class StageSummary:
+    """彙整單一階段內逐事件的訊息，於 flush() 時輸出一行摘要。
+
+    record() 用於大量的一般訊息：每種只記錄前 sample_size 筆，其餘僅計數；
+    report() 用於錯誤與警告：每筆都記錄並計數。"""
+
+    def __init__(self, stage, sample_size=None, logger=None):
+        self.stage = stage
+        self.sample_size = config.LOG_SAMPLE_SIZE if sample_size is None else sample_size
+        self.logger = logger or logging.getLogger()
+        self.counts = {}
+        self.suppressed = 0
+
+    def count(self, key, n=1):
+        self.counts[key] = self.counts.get(key, 0) + n
+        return self.counts[key]
+
+    def record(self, key, level, msg, *args):
+        if self.count(key) > self.sample_size:
+            self.suppressed += 1
+        elif self.logger.isEnabledFor(level):
+            self.logger.log(level, msg, *args)
+
+    def report(self, key, level, msg, *args):
+        self.count(key)
+        self.logger.log(level, msg, *args)
+
+    def flush(self, level=logging.INFO, partial=False):
+        if not self.counts:
+            return
+        summary = "，".join(f"{key} {count}" for key, count in self.counts.items())
+        self.logger.log(level, "[%s] %s：%s（省略 %d 筆明細）", self.stage,
+                        "中斷前的部分摘要" if partial else "摘要", summary, self.suppressed)
+        self.counts = {}
+        self.suppressed = 0
@@ -16,20 +16,7 @@ from google.auth.exceptions import RefreshError
 from ics import Calendar
 from ics.event import Event
 import config as config  # 引用設定檔
-
-# 初始化 logging
-logging.basicConfig(
-    filename=config.LOG_FILE,
-    level=getattr(logging, config.LOG_LEVEL.upper(), "INFO"),
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
-# 新增 StreamHandler 將 log 輸出到終端機
-# console_handler = logging.StreamHandler()
-# console_handler.setLevel(getattr(logging, config.LOG_LEVEL.upper(), "INFO"))
-# console_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-# console_handler.setFormatter(console_formatter)
-# logging.getLogger().addHandler(console_handler)
+from log_utils import StageSummary, setup_logging, stop_logging
 
 # ---------- HASH / SYNC RECORD ----------
 def compute_event_hash(event):
@@ -102,17 +89,19 @@ def get_events_from_json(json_file):
     with open(json_file, 'r', encoding='utf-8') as f:
         events_data = json.load(f)
     valid_events = []
+    summary = StageSummary("讀取事件")
     
     for event_data in events_data:
         try:
             # 檢查是否為字典並包含必要欄位
             if not isinstance(event_data, dict):
-                logging.warning(f"跳過非字典格式事件: {event_data}")
+                summary.report("非字典格式", logging.WARNING, "跳過非字典格式事件: %s", type(event_data).__name__)
                 continue
                 
             # 檢查必要欄位是否存在
             if 'begin' not in event_data or 'end' not in event_data or 'name' not in event_data:
-                logging.warning(f"跳過缺少必要欄位的事件: {event_data}")
+                summary.report("缺少必要欄位", logging.WARNING, "跳過缺少必要欄位的事件: uid=%s, name=%s",
+                               event_data.get('uid'), event_data.get('name'))
                 continue
                 
             event = Event()
@@ -142,8 +131,12 @@ def get_events_from_json(json_file):
                 
             valid_events.append(event)
         except Exception as e:
-            logging.warning(f"解析事件失敗: {e}, 事件資料: {event_data}")
+            summary.report("解析失敗", logging.WARNING, "解析事件失敗: %s, uid=%s", e,
+                           event_data.get('uid') if isinstance(event_data, dict) else None)
     
+    summary.count("有效事件", len(valid_events))
+    summary.flush()
+
     # 創建新的 Calendar 物件並添加所有有效事件
     new_calendar = Calendar()
     for event in valid_events:
@@ -183,7 +176,7 @@ def convert_ics_to_google_event(ics_event):
     # 處理例外日期 - 修改這部分
     if hasattr(ics_event, 'extra'):
         # 添加調試日誌
-        logging.debug(f"處理事件例外日期: {ics_event.name}, extra 類型: {type(ics_event.extra)}")
+        logging.debug("處理事件例外日期: %s, extra 類型: %s", ics_event.name, type(ics_event.extra))
         
         # 當 extra 是字典時
         if isinstance(ics_event.extra, dict) and 'exdate' in ics_event.extra:
@@ -199,7 +192,7 @@ def convert_ics_to_google_event(ics_event):
                 
                 # 使用正確的時區格式
                 google_event["recurrence"].append(f"EXDATE;TZID={config.TIMEZONE}:{exdate_cleaned}")
-                logging.debug(f"添加例外日期: {exdate} -> EXDATE;TZID={config.TIMEZONE}:{exdate_cleaned}")
+                logging.debug("添加例外日期: %s -> EXDATE;TZID=%s:%s", exdate, config.TIMEZONE, exdate_cleaned)
         
         # 當 extra 是 Container 物件時
         elif hasattr(ics_event.extra, 'exdate'):
@@ -214,7 +207,7 @@ def convert_ics_to_google_event(ics_event):
                     exdate_cleaned = f"{exdate_cleaned}T000000"
                 
                 google_event["recurrence"].append(f"EXDATE;TZID={config.TIMEZONE}:{exdate_cleaned}")
-                logging.debug(f"添加例外日期 (Container): {exdate} -> EXDATE;TZID={config.TIMEZONE}:{exdate_cleaned}")
+                logging.debug("添加例外日期 (Container): %s -> EXDATE;TZID=%s:%s", exdate, config.TIMEZONE, exdate_cleaned)
 
     # 處理週期事件的例外 (時間被修改的實例)
     if hasattr(ics_event, 'is_recurrence_exception') and ics_event.is_recurrence_exception:
@@ -230,19 +223,20 @@ def convert_ics_to_google_event(ics_event):
             'timeZone': config.TIMEZONE
         }
         
-        logging.debug(f"處理週期事件例外: {ics_event.name}, 原始開始時間: {ics_event.recurrence_id}")
+        logging.debug("處理週期事件例外: %s, 原始開始時間: %s", ics_event.name, ics_event.recurrence_id)
 
     # 調試輸出
     if 'recurrence' in google_event:
-        logging.debug(f"事件 {ics_event.name} 的完整 recurrence 參數: {google_event['recurrence']}")
+        logging.debug("事件 %s 的完整 recurrence 參數: %s", ics_event.name, google_event['recurrence'])
 
     return google_event
 
 # ---------- SYNC ----------
 def sync_to_google(json_file, calendar_id=config.DEFAULT_CALENDAR_ID):
-    logging.info(f"開始同步 {json_file} 至 Google Calendar (Calendar ID: {calendar_id})")
+    logging.info("開始同步 %s 至 Google Calendar (Calendar ID: %s)", json_file, calendar_id)
     creds = get_credentials()
     service = build('calendar', 'v3', credentials=creds)
+    summary = StageSummary("同步")
 
     try:
         calendar = get_events_from_json(json_file)
@@ -267,7 +261,7 @@ def sync_to_google(json_file, calendar_id=config.DEFAULT_CALENDAR_ID):
         for event in calendar.events:
             # 確保 event 是 Event 物件
             if not isinstance(event, Event):
-                logging.warning(f"跳過非 Event 物件: {event}")
+                summary.report("非 Event 物件", logging.WARNING, "跳過非 Event 物件: %s", type(event).__name__)
                 continue
 
             # 安全獲取 rrule
@@ -308,23 +302,25 @@ def sync_to_google(json_file, calendar_id=config.DEFAULT_CALENDAR_ID):
 
                 if last_sync.get(event_id) == event_hash:
                     skipped += 1
-                    logging.info(f"🟡 跳過未變更事件: {google_event['summary']}")
+                    summary.record("跳過", logging.INFO, "🟡 跳過未變更事件: %s", google_event['summary'])
                     continue
 
                 # 如果事件 ID 已存在，先刪除再插入
                 if event_id in google_events_dict:
                     try:
                         service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
-                        logging.info(f"❌ 刪除重複事件: {google_event['summary']}")
+                        summary.record("刪除重複", logging.INFO, "❌ 刪除重複事件: %s", google_event['summary'])
                     except Exception as e:
-                        logging.warning(f"⚠️ 刪除重複事件失敗: {e}")
+                        summary.report("刪除失敗", logging.WARNING, "⚠️ 刪除重複事件失敗: %s (id=%s): %s",
+                                       google_event['summary'], event_id, e)
 
                 try:
                     service.events().insert(calendarId=calendar_id, body=google_event).execute()
                     added += 1
-                    logging.info(f"🆕 新增事件: {google_event['summary']}")
+                    summary.record("新增", logging.INFO, "🆕 新增事件: %s", google_event['summary'])
                 except Exception as e:
-                    logging.error(f"⚠️ 插入事件失敗: {e}")
+                    summary.report("插入失敗", logging.ERROR, "⚠️ 插入事件失敗: %s (id=%s): %s",
+                                   google_event['summary'], event_id, e)
 
         # 先處理週期事件
         for event in recurring_events:
@@ -341,23 +337,25 @@ def sync_to_google(json_file, calendar_id=config.DEFAULT_CALENDAR_ID):
 
             if last_sync.get(event_id) == event_hash:
                 skipped += 1
-                logging.info(f"🟡 跳過未變更事件: {google_event['summary']}")
+                summary.record("跳過", logging.INFO, "🟡 跳過未變更事件: %s", google_event['summary'])
                 continue
 
             # 如果事件 ID 已存在，先刪除再插入
             if event_id in google_events_dict:
                 try:
                     service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
-                    logging.info(f"❌ 刪除重複事件: {google_event['summary']}")
+                    summary.record("刪除重複", logging.INFO, "❌ 刪除重複事件: %s", google_event['summary'])
                 except Exception as e:
-                    logging.warning(f"⚠️ 刪除重複事件失敗: {e}")
+                    summary.report("刪除失敗", logging.WARNING, "⚠️ 刪除重複事件失敗: %s (id=%s): %s",
+                                   google_event['summary'], event_id, e)
 
             try:
                 service.events().insert(calendarId=calendar_id, body=google_event).execute()
                 added += 1
-                logging.info(f"🆕 新增事件: {google_event['summary']}")
+                summary.record("新增", logging.INFO, "🆕 新增事件: %s", google_event['summary'])
             except Exception as e:
-                logging.error(f"⚠️ 插入事件失敗: {e}")
+                summary.report("插入失敗", logging.ERROR, "⚠️ 插入事件失敗: %s (id=%s): %s",
+                               google_event['summary'], event_id, e)
 
         # 再處理例外事件
         for event in exception_events:
@@ -374,31 +372,40 @@ def sync_to_google(json_file, calendar_id=config.DEFAULT_CALENDAR_ID):
 
             if last_sync.get(event_id) == event_hash:
                 skipped += 1
-                logging.info(f"🟡 跳過未變更事件: {google_event['summary']}")
+                summary.record("跳過", logging.INFO, "🟡 跳過未變更事件: %s", google_event['summary'])
                 continue
 
             # 如果事件 ID 已存在，先刪除再插入
             if event_id in google_events_dict:
                 try:
                     service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
-                    logging.info(f"❌ 刪除重複事件: {google_event['summary']}")
+                    summary.record("刪除重複", logging.INFO, "❌ 刪除重複事件: %s", google_event['summary'])
                 except Exception as e:
-                    logging.warning(f"⚠️ 刪除重複事件失敗: {e}")
+                    summary.report("刪除失敗", logging.WARNING, "⚠️ 刪除重複事件失敗: %s (id=%s): %s",
+                                   google_event['summary'], event_id, e)
 
             try:
                 service.events().insert(calendarId=calendar_id, body=google_event).execute()
                 added += 1
-                logging.info(f"🆕 新增事件: {google_event['summary']}")
+                summary.record("新增", logging.INFO, "🆕 新增事件: %s", google_event['summary'])
             except Exception as e:
-                logging.error(f"⚠️ 插入事件失敗: {e}")
+                summary.report("插入失敗", logging.ERROR, "⚠️ 插入事件失敗: %s (id=%s): %s",
+                               google_event['summary'], event_id, e)
 
         # 儲存同步紀錄
         save_last_sync(new_sync, calendar_id)
-        logging.info(f"✅ 同步完成：新增 {added}，更新 {updated}，跳過 {skipped}，刪除 {deleted}")
+        summary.flush()
+        logging.info("✅ 同步完成：新增 %d，更新 %d，跳過 %d，刪除 %d", added, updated, skipped, deleted)
     except Exception as e:
-        logging.error(f"同步過程中發生錯誤: {e}")
+        # 保留中斷前已寫入 Google Calendar 的統計
+        summary.flush(logging.WARNING, partial=True)
+        logging.error("同步過程中發生錯誤: %s", e)
 
 # ---------- MAIN ----------
 if __name__ == "__main__":
-    logging.info(f"開始同步 {config.DEFAULT_JSON_FILE} 至 Google Calendar...")
-    sync_to_google(config.DEFAULT_JSON_FILE)
+    setup_logging(console=False)
+    try:
+        logging.info("開始同步 %s 至 Google Calendar...", config.DEFAULT_JSON_FILE)
+        sync_to_google(config.DEFAULT_JSON_FILE)
+    finally:
+        stop_logging()
@@ -4,29 +4,17 @@ import json
 import config
 import logging
 from datetime import datetime
-
-# 初始化 logging
-logging.basicConfig(
-    filename=config.LOG_FILE,
-    level=getattr(logging, config.LOG_LEVEL.upper(), "INFO"),
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
-# 新增 StreamHandler 將 log 輸出到終端機
-# console_handler = logging.StreamHandler()
-# console_handler.setLevel(getattr(logging, config.LOG_LEVEL.upper(), "INFO"))
-# console_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-# console_handler.setFormatter(console_formatter)
-# logging.getLogger().addHandler(console_handler)
+from log_utils import StageSummary, setup_logging, stop_logging
 
 def fetch_ics_from_url(url: str) -> Calendar:
-    logging.info(f"從 URL 獲取 ICS 檔案: {url}")
+    logging.info("從 URL 獲取 ICS 檔案: %s", url)
     response = requests.get(url)
     response.raise_for_status()
     return Calendar(response.text)
 
 def calendar_to_json(calendar):
     logging.info("將 Calendar 轉換為 JSON 格式")
+    summary = StageSummary("ICS 轉 JSON")
     
     # 第一步：按 UID 分組事件
     events_by_uid = {}
@@ -108,9 +96,11 @@ def calendar_to_json(calendar):
                                     else:
                                         until_time = datetime.strptime(base_time_str, "%Y%m%d")
                                     
-                                    logging.debug(f"成功解析 UNTIL 時間: {until_str} -> {until_time}")
+                                    logging.debug("成功解析 UNTIL 時間: %s -> %s", until_str, until_time)
                                 except Exception as e:
-                                    logging.warning(f"無法解析 UNTIL 時間: {until_str}, 錯誤: {e}")
+                                    summary.report("UNTIL 解析失敗", logging.WARNING,
+                                                   "無法解析 UNTIL 時間: %s, uid=%s, 錯誤: %s",
+                                                   until_str, recurring_event.uid, e)
                 
                 if is_in_range:
                     # 格式化時間為 YYYYMMDDTHHMMSSZ
@@ -188,20 +178,26 @@ def calendar_to_json(calendar):
             result_events.append(event_json)
             
         except Exception as e:
-            logging.error(f"解析事件失敗: {e}")
-    
+            summary.report("解析失敗", logging.ERROR, "解析事件失敗: uid=%s, 錯誤: %s",
+                           getattr(event, 'uid', None), e)
+
+    summary.count("轉換成功", len(result_events))
+    summary.flush()
     return result_events
 
 def save_json_to_file(events: list, output_path: str):
-    logging.info(f"將事件 JSON 儲存到檔案: {output_path}")
+    logging.info("將事件 JSON 儲存到檔案: %s", output_path)
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(events, f, ensure_ascii=False, indent=2)
 
 if __name__ == "__main__":
+    setup_logging(console=False)
     try:
         calendar = fetch_ics_from_url(config.ICS_URL)
         events_json = calendar_to_json(calendar)
         save_json_to_file(events_json, config.OUTPUT_JSON_FILE)
         logging.info("ICS 轉換為 JSON 並儲存完成")
     except Exception as e:
-        logging.error(f"執行過程中發生錯誤: {e}")
+        logging.error("執行過程中發生錯誤: %s", e)
+    finally:
+        stop_logging()
@@ -1,23 +1,13 @@
 from parse_ics2json import fetch_ics_from_url, calendar_to_json, save_json_to_file
 from main import sync_to_google
+from log_utils import setup_logging, stop_logging
 import config
 import logging
 
 if __name__ == "__main__":
-    # 初始化 logging
-    logging.basicConfig(
-        filename=config.LOG_FILE,
-        level=getattr(logging, config.LOG_LEVEL.upper(), "INFO"),
-        format="%(asctime)s - %(levelname)s - %(message)s"
-    )
+    # 初始化 logging（背景執行緒寫入檔案與終端機）
+    setup_logging()
 
-    # 新增 StreamHandler 將 log 輸出到終端機
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, config.LOG_LEVEL.upper(), "INFO"))
-    console_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    console_handler.setFormatter(console_formatter)
-    logging.getLogger().addHandler(console_handler)
-    
     try:
         # Step 1: Fetch ICS and convert to JSON
         calendar = fetch_ics_from_url(config.ICS_URL)
@@ -28,4 +18,6 @@ if __name__ == "__main__":
         # Step 2: Sync JSON to Google Calendar
         sync_to_google(config.OUTPUT_JSON_FILE)
     except Exception as e:
-        logging.error(f"執行過程中發生錯誤: {e}")
\ No newline at end of file
+        logging.error("執行過程中發生錯誤: %s", e)
+    finally:
+        stop_logging()
\ No newline at end of file
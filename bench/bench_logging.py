@@ -0,0 +1,90 @@
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# 量測逐事件 logging 的成本：模擬同步迴圈，每個事件一行 debug 與一行 info
+# 用法：python bench/bench_logging.py [事件數量，預設 100000]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+import config
+from log_utils import LOG_FORMAT, StageSummary, setup_logging, stop_logging
+
+
+def _make_events(n):
+    return [
+        {
+            "summary": f"event {i}",
+            "recurrence": [f"EXDATE;TZID={config.TIMEZONE}:2025{i % 12 + 1:02d}01T000000"] * 5,
+        }
+        for i in range(n)
+    ]
+
+
+def _count_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+def bench_sync_logging(events, log_file):
+    """舊做法：同步寫入檔案，f-string 立即格式化，逐事件全部記錄。"""
+    root = logging.getLogger()
+    handler = logging.FileHandler(log_file, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+    start = time.perf_counter()
+    for event in events:
+        logging.debug(f"事件 {event['summary']} 的完整 recurrence 參數: {event['recurrence']}")
+        logging.info(f"🆕 新增事件: {event['summary']}")
+    logging.info(f"✅ 同步完成：新增 {len(events)}")
+    elapsed = time.perf_counter() - start
+
+    root.removeHandler(handler)
+    handler.close()
+    return elapsed
+
+
+def bench_queue_logging(events, log_file, sample_size):
+    """新做法：QueueListener 背景寫入，延遲格式化，StageSummary 抽樣（sample_size 設為事件數量即不抽樣）。"""
+    saved_log_file = config.LOG_FILE
+    config.LOG_FILE = log_file
+    try:
+        setup_logging(console=False)
+
+        start = time.perf_counter()
+        summary = StageSummary("同步", sample_size=sample_size)
+        for event in events:
+            logging.debug("事件 %s 的完整 recurrence 參數: %s", event['summary'], event['recurrence'])
+            summary.record("新增", logging.INFO, "🆕 新增事件: %s", event['summary'])
+        summary.flush()
+        logging.info("✅ 同步完成：新增 %d", len(events))
+        # 計入背景執行緒寫完所有紀錄的時間
+        stop_logging()
+        return time.perf_counter() - start
+    finally:
+        config.LOG_FILE = saved_log_file
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    events = _make_events(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [
+            ("同步寫入 + f-string", lambda path: bench_sync_logging(events, path)),
+            (f"queue + 抽樣 {config.LOG_SAMPLE_SIZE} 筆",
+             lambda path: bench_queue_logging(events, path, config.LOG_SAMPLE_SIZE)),
+            ("queue，不抽樣", lambda path: bench_queue_logging(events, path, n)),
+        ]
+        print(f"事件數量: {n}")
+        for i, (name, run) in enumerate(cases):
+            path = os.path.join(tmp, f"bench_{i}.log")
+            elapsed = run(path)
+            print(f"{name:<24} {elapsed:7.3f}s  {_count_lines(path):>8} 行")
+
+
+if __name__ == "__main__":
+    main()